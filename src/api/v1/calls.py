@@ -17,35 +17,66 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from asyncio import to_thread
-from datetime import UTC, datetime, timedelta
-from io import BytesIO
+from asyncio import Queue, to_thread, wait_for
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from hashlib import file_digest, sha256
+from json import loads
+from mimetypes import guess_type
 from pathlib import Path
-from typing import Annotated
-from uuid import UUID, uuid4
+from typing import Annotated, BinaryIO
+from urllib.parse import urlsplit
+from uuid import UUID
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
+    Header,
     HTTPException,
+    Query,
+    Request,
     Response,
     UploadFile,
     status,
 )
-from minio import Minio
-from pydantic_extra_types.phone_numbers import PhoneNumber
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from orjson import dumps
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_, union
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from config import Settings
-from database.session import provide_async_session
-from models.call import Call, Record
-from schemas.call import CallCreate, CallFullResponse
-from worker.tasks import process_record_task
+from config import get_settings
+from database.session import provide_async_session, provide_read_only_session
+from models.call import Call, CallStatus, Record
+from schemas.call import (
+    CallBulkError,
+    CallBulkResponse,
+    CallCreate,
+    CallFullResponse,
+    CallPage,
+    PhoneNumber,
+)
+from utils.batcher import record_batcher
+from utils.cache import (
+    cache_call,
+    get_cached_call,
+    get_call_version,
+    invalidate_calls,
+)
+from utils.events import call_event_hub, publish_call_statuses
+from utils.minio import get_minio_client, get_presigned_url
 
 router = APIRouter(prefix="/calls", tags=["calls"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+call_with_record = joinedload(Call.record)
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_call(
@@ -56,31 +87,129 @@ async def create_call(
     new_call = Call(**call_data.model_dump())
     session.add(new_call)
     await session.flush()
-    Settings().logger.info("%s", new_call)
+    get_settings().logger.info("%s", new_call)
     return new_call.id
 
 
-def save_to_minio(file: bytes, file_name: str) -> None:
-    minio_client = Minio(
-        Settings().minio_endpoint,
-        access_key=Settings().minio_access_key,
-        secret_key=Settings().minio_secret_key,
-        secure=True,
-        cert_check=False,
-    )
+async def stream_bulk_body(request: Request) -> AsyncGenerator[bytes]:
+    max_bytes = get_settings().calls_bulk_max_bytes
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="Request body too large",
+        )
+
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail="Request body too large",
+            )
+        yield chunk
+
+
+async def read_bulk_items(request: Request) -> list[bytes | object]:
+    max_items = get_settings().calls_bulk_max_items
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        items: list[bytes | object] = []
+        buffer = b""
+        async for chunk in stream_bulk_body(request):
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            items.extend(line for line in lines if line.strip())
+            if len(items) > max_items:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail="Too many calls",
+                )
+        if buffer.strip():
+            items.append(buffer)
+    else:
+        try:
+            items = loads(
+                b"".join([chunk async for chunk in stream_bulk_body(request)]),
+            )
+        except ValueError as error:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON",
+            ) from error
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Expected a JSON array of calls",
+            )
+
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="Too many calls",
+        )
+    return items
+
+
+@router.post("/bulk/", status_code=status.HTTP_201_CREATED)
+async def create_calls_bulk(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(provide_async_session)],
+) -> CallBulkResponse:
+    items = await read_bulk_items(request)
+
+    indexes: list[int] = []
+    new_calls: list[dict[str, object]] = []
+    errors: list[CallBulkError] = []
+    for index, item in enumerate(items):
+        try:
+            call_data = (
+                CallCreate.model_validate_json(item)
+                if isinstance(item, bytes)
+                else CallCreate.model_validate(item)
+            )
+        except ValidationError as error:
+            errors.append(
+                CallBulkError(
+                    index=index,
+                    errors=error.errors(include_url=False, include_context=False),
+                ),
+            )
+            continue
+        call_data.started_at = call_data.started_at.replace(tzinfo=None)
+        indexes.append(index)
+        new_calls.append(call_data.model_dump())
+
+    ids: list[UUID | None] = [None] * len(items)
+    if new_calls:
+        new_ids = await session.scalars(
+            insert(Call).returning(Call.id, sort_by_parameter_order=True),
+            new_calls,
+        )
+        for index, call_id in zip(indexes, new_ids, strict=True):
+            ids[index] = call_id
+
+    get_settings().logger.info("bulk created %d calls", len(new_calls))
+    return CallBulkResponse(ids=ids, errors=errors)
 
-    if not minio_client.bucket_exists(Settings().minio_bucket_name):
-        minio_client.make_bucket(Settings().minio_bucket_name)
 
+def hash_file(file: BinaryIO) -> str:
+    content_hash = file_digest(file, "sha256").hexdigest()
+    file.seek(0)
+    return content_hash
+
+
+def save_to_minio(file: BinaryIO, file_name: str) -> None:
     try:
-        minio_client.put_object(
-            bucket_name=Settings().minio_bucket_name,
+        get_minio_client().put_object(
+            bucket_name=get_settings().minio_bucket_name,
             object_name=file_name,
-            data=BytesIO(file),
-            length=len(file),
+            data=file,
+            length=-1,
+            content_type=guess_type(file_name)[0] or "application/octet-stream",
+            part_size=get_settings().minio_part_size,
+            num_parallel_uploads=get_settings().minio_parallel_uploads,
         )
     except Exception as e:
-        Settings().logger.exception(f"Error uploading file to MinIO: {e}")
+        get_settings().logger.exception(f"Error uploading file to MinIO: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload file to storage",
@@ -92,6 +221,7 @@ async def upload_recording(
     call_id: UUID,
     file: UploadFile,
     session: Annotated[AsyncSession, Depends(provide_async_session)],
+    background_tasks: BackgroundTasks,
 ) -> Response:
     call = await session.get(Call, call_id)
     if not call:
@@ -100,83 +230,336 @@ async def upload_recording(
             detail="Call not found",
         )
 
-    file_extension = Path(file.filename or "recording").suffix
-    file_name = f"calls/{call_id}/{uuid4()}{file_extension}"
+    content_hash = await to_thread(hash_file, file.file)
+    duplicate = (
+        await session.execute(
+            select(Record, Call.status)
+            .join(Call, Call.id == Record.call_id)
+            .where(Record.content_hash == content_hash)
+            .order_by((Call.status == CallStatus.READY).desc())
+            .limit(1),
+        )
+    ).first()
 
-    await to_thread(save_to_minio, await file.read(), file_name)
+    if duplicate is None:
+        file_extension = Path(file.filename or "recording").suffix
+        file_name = f"recordings/{content_hash}{file_extension}"
+        await to_thread(save_to_minio, file.file, file_name)
+    else:
+        file_name = duplicate.Record.object_path
 
     new_record = Record(
         call_id=call_id,
         filename=file.filename or "unknown",
         object_path=file_name,
+        content_hash=content_hash,
         duration=0.0,
         transcription="",
         presigned_url="",
         expires_at=datetime.now(UTC).replace(tzinfo=None),
     )
+    processed = duplicate is not None and duplicate.status == CallStatus.READY
+    if processed:
+        new_record.duration = duplicate.Record.duration
+        new_record.transcription = duplicate.Record.transcription
+        new_record.silent_ranges = duplicate.Record.silent_ranges
+        call.status = CallStatus.READY
     session.add(new_record)
     try:
         await session.flush()
     except IntegrityError as error:
-        Settings().logger.info("unique constraint failed: %s", error)
+        get_settings().logger.info("unique constraint failed: %s", error)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Duplicate recording",
         ) from error
 
-    process_record_task.delay(new_record.id)
+    if not processed:
+        background_tasks.add_task(record_batcher.add, new_record.id)
+    background_tasks.add_task(invalidate_calls, [call_id])
+    if processed:
+        background_tasks.add_task(publish_call_statuses, [call_id], CallStatus.READY)
     return Response(status_code=status.HTTP_201_CREATED)
 
 
-def get_call_with_record(call: Call) -> Call:
-    if call.record is None:
-        return call
-
-    if call.record.expires_at >= datetime.now(UTC).replace(tzinfo=None):
-        return call
-
-    minio_client = Minio(
-        Settings().minio_endpoint,
-        access_key=Settings().minio_access_key,
-        secret_key=Settings().minio_secret_key,
-        secure=True,
-        cert_check=False,
+@router.get("/{call_id}/recording/stream/")
+async def stream_recording(
+    call_id: UUID,
+    session: Annotated[AsyncSession, Depends(provide_read_only_session)],
+) -> Response:
+    object_path = await session.scalar(
+        select(Record.object_path).where(Record.call_id == call_id),
     )
-    call.record.presigned_url = minio_client.presigned_get_object(
-        bucket_name=Settings().minio_bucket_name,
-        object_name=call.record.object_path,
-        expires=timedelta(hours=1),
+    if object_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found",
+        )
+
+    url = urlsplit(get_presigned_url(object_path)[0])
+    return Response(
+        headers={
+            "X-Accel-Redirect": (
+                f"{get_settings().minio_accel_location}{url.path}?{url.query}"
+            ),
+            "X-Accel-Buffering": "no",
+        },
     )
-    call.record.expires_at = (datetime.now(UTC) + timedelta(hours=1)).replace(
-        tzinfo=None,
+
+
+def get_call_with_record(call: Call) -> CallFullResponse:
+    response = CallFullResponse.model_validate(call)
+    if response.record is None:
+        return response
+
+    response.record.presigned_url, response.record.expires_at = get_presigned_url(
+        call.record.object_path,
     )
+    return response
+
+
+def encode_cursor(started_at: datetime, call_id: UUID) -> str:
+    return urlsafe_b64encode(f"{started_at.isoformat()}|{call_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        started_at, call_id = urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(started_at), UUID(call_id)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from error
+
+
+call_row_columns = (
+    Call.id,
+    Call.caller,
+    Call.receiver,
+    Call.started_at,
+    Call.status,
+    Record.filename,
+    Record.duration,
+    Record.transcription,
+    Record.silent_ranges,
+    Record.object_path,
+)
 
-    return call
 
+def dump_call_row(row: Row) -> dict[str, object]:
+    record = None
+    if row.object_path is not None:
+        presigned_url, expires_at = get_presigned_url(row.object_path)
+        record = {
+            "filename": row.filename,
+            "duration": row.duration,
+            "transcription": row.transcription,
+            "silent_ranges": [
+                {"start": float(start), "end": float(end)}
+                for start, end in row.silent_ranges
+            ],
+            "presigned_url": presigned_url,
+            "expires_at": expires_at,
+        }
+    return {
+        "id": row.id,
+        "caller": row.caller,
+        "receiver": row.receiver,
+        "started_at": row.started_at,
+        "status": row.status,
+        "record": record,
+    }
 
-@router.get("/find/", response_model=list[CallFullResponse])
-async def find_call(
+
+@router.get("/find/", response_model=CallPage)
+async def find_call(  # noqa: PLR0913
     phone_number: PhoneNumber,
-    session: Annotated[AsyncSession, Depends(provide_async_session)],
-) -> list[Call]:
-    calls = await session.scalars(
-        select(Call).where(
-            (Call.caller == phone_number) | (Call.receiver == phone_number),
+    session: Annotated[AsyncSession, Depends(provide_read_only_session)],
+    started_from: datetime | None = None,
+    started_to: datetime | None = None,
+    call_status: Annotated[CallStatus | None, Query(alias="status")] = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> Response | CallPage:
+    conditions = []
+    if started_from is not None:
+        conditions.append(Call.started_at >= started_from.replace(tzinfo=None))
+    if started_to is not None:
+        conditions.append(Call.started_at < started_to.replace(tzinfo=None))
+    if call_status is not None:
+        conditions.append(Call.status == call_status)
+    if cursor is not None:
+        conditions.append(tuple_(Call.started_at, Call.id) > decode_cursor(cursor))
+
+    page = union(
+        *(
+            select(Call.id, Call.started_at)
+            .where(phone_column == phone_number, *conditions)
+            .order_by(Call.started_at, Call.id)
+            .limit(limit + 1)
+            for phone_column in (Call.caller, Call.receiver)
         ),
+    ).subquery()
+
+    if get_settings().calls_fast_json:
+        rows = (
+            await session.execute(
+                select(*call_row_columns)
+                .join(page, Call.id == page.c.id)
+                .outerjoin(Record, Record.call_id == Call.id)
+                .order_by(Call.started_at, Call.id)
+                .limit(limit + 1),
+            )
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(rows[limit - 1].started_at, rows[limit - 1].id)
+        return Response(
+            content=dumps(
+                {
+                    "items": [dump_call_row(row) for row in rows[:limit]],
+                    "next_cursor": next_cursor,
+                },
+            ),
+            media_type="application/json",
+        )
+
+    result = await session.scalars(
+        select(Call)
+        .join(page, Call.id == page.c.id)
+        .order_by(Call.started_at, Call.id)
+        .limit(limit + 1)
+        .options(call_with_record),
+    )
+    calls = result.all()
+
+    next_cursor = None
+    if len(calls) > limit:
+        next_cursor = encode_cursor(calls[limit - 1].started_at, calls[limit - 1].id)
+    return CallPage(
+        items=[get_call_with_record(call) for call in calls[:limit]],
+        next_cursor=next_cursor,
+    )
+
+
+def make_etag(
+    call_updated_at: datetime,
+    record_updated_at: datetime | None,
+    url_expires_at: datetime | None,
+) -> str:
+    version = f"{call_updated_at}|{record_updated_at}|{url_expires_at}"
+    return f'"{sha256(version.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag},
     )
-    return [await to_thread(get_call_with_record, call) for call in calls.unique()]
 
 
 @router.get("/{call_id}/", response_model=CallFullResponse)
 async def get_call(
     call_id: UUID,
-    session: Annotated[AsyncSession, Depends(provide_async_session)],
-) -> Call:
-    call = await session.scalar(select(Call).where(Call.id == call_id))
+    session: Annotated[AsyncSession, Depends(provide_read_only_session)],
+    http_response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response | CallFullResponse:
+    cached = await get_cached_call(call_id)
+    if cached is not None:
+        etag, payload = cached
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return Response(
+            content=payload,
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    cache_version = await get_call_version(call_id)
+    if if_none_match is not None:
+        version = (
+            await session.execute(
+                select(Call.updated_at, Record.updated_at, Record.object_path)
+                .outerjoin(Record, Record.call_id == Call.id)
+                .where(Call.id == call_id),
+            )
+        ).first()
+        if version is not None:
+            call_updated_at, record_updated_at, object_path = version
+            etag = make_etag(
+                call_updated_at,
+                record_updated_at,
+                get_presigned_url(object_path)[1] if object_path else None,
+            )
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    call = await session.scalar(
+        select(Call).where(Call.id == call_id).options(call_with_record),
+    )
     if call is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Call not found",
         )
 
-    return await to_thread(get_call_with_record, call)
+    response = get_call_with_record(call)
+    etag = make_etag(
+        call.updated_at,
+        call.record.updated_at if call.record else None,
+        response.record.expires_at if response.record else None,
+    )
+    await cache_call(response, etag, cache_version)
+    http_response.headers["ETag"] = etag
+    return response
+
+
+async def stream_call_events(
+    call_id: UUID,
+    call_status: CallStatus,
+    queue: Queue[CallStatus],
+) -> AsyncGenerator[str]:
+    try:
+        yield f"event: status\ndata: {call_status}\n\n"
+        while call_status != CallStatus.READY:
+            try:
+                call_status = await wait_for(
+                    queue.get(),
+                    get_settings().call_events_keepalive.total_seconds(),
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: status\ndata: {call_status}\n\n"
+    finally:
+        call_event_hub.unsubscribe(call_id, queue)
+
+
+@router.get("/{call_id}/events/")
+async def get_call_events(
+    call_id: UUID,
+    session: Annotated[AsyncSession, Depends(provide_read_only_session)],
+) -> StreamingResponse:
+    queue = call_event_hub.subscribe(call_id)
+    call_status = await session.scalar(select(Call.status).where(Call.id == call_id))
+    if call_status is None:
+        call_event_hub.unsubscribe(call_id, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Call not found",
+        )
+
+    return StreamingResponse(
+        stream_call_events(call_id, call_status, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -17,6 +17,8 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from datetime import timedelta
+from functools import cache
 from logging import Logger, getLogger
 from os import environ
 from pathlib import Path
@@ -28,11 +30,51 @@ class Settings(BaseSettings):
     base_dir: Path = Path(__file__).resolve().parent.parent
 
     database_url: str = environ["DATABASE_URL"]
+    database_replica_url: str | None = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = False
+    database_statement_cache_size: int = 100
+    database_pgbouncer: bool = False
+
     redis_url: str = environ["REDIS_URL"]
 
     minio_endpoint: str = environ["MINIO_ENDPOINT"]
     minio_access_key: str = environ["MINIO_ACCESS_KEY"]
     minio_secret_key: str = environ["MINIO_SECRET_KEY"]
     minio_bucket_name: str = environ["MINIO_BUCKET_NAME"]
+    minio_region: str = "us-east-1"
+    minio_pool_size: int = 10
+    minio_part_size: int = 16 * 1024 * 1024
+    minio_parallel_uploads: int = 1
+    minio_accel_location: str = "/internal/minio"
+
+    audio_sample_rate: int = 16_000
+    audio_block_seconds: int = 10
+    audio_seekable_formats: set[str] = {".3gp", ".m4a", ".mov", ".mp4"}
+
+    calls_bulk_max_items: int = 10_000
+    calls_bulk_max_bytes: int = 4 * 1024 * 1024
+    calls_fast_json: bool = False
+    phone_number_cache_size: int = 65_536
+
+    record_batch_size: int = 1
+    record_batch_window: timedelta = timedelta(milliseconds=500)
+
+    worker_prefetch_depth: int = 8
+    worker_analysis_processes: int | None = None
+
+    call_cache_ttl: timedelta = timedelta(minutes=5)
+    call_events_keepalive: timedelta = timedelta(seconds=15)
+
+    presigned_url_expires: timedelta = timedelta(hours=1)
+    presigned_url_refresh: timedelta = timedelta(minutes=5)
+    presigned_url_cache_size: int = 10_000
 
     logger: Logger = getLogger("fastapi")
+
+
+@cache
+def get_settings() -> Settings:
+    return Settings()
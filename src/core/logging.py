@@ -20,11 +20,11 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from logging import INFO, FileHandler, StreamHandler, basicConfig
 from sys import stdout
 
-from config import Settings
+from config import get_settings
 
 
 def setup_logging() -> None:
-    logs_dir = Settings().base_dir / "logs/" / "fastapi"
+    logs_dir = get_settings().base_dir / "logs/" / "fastapi"
     logs_dir.mkdir(parents=True, exist_ok=True)
     logging_format = (
         "%(asctime)s - %(levelname)s - %(name)s - %(filename)s:%(lineno)d - %(message)s"
@@ -17,9 +17,49 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from uuid import uuid4
 
-from config import Settings
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
-engine = create_async_engine(Settings().database_url)
+from config import get_settings
+
+
+def prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def create_engine(url: str | None = None) -> AsyncEngine:
+    connect_args: dict[str, object] = {
+        "statement_cache_size": get_settings().database_statement_cache_size,
+        "prepared_statement_cache_size": get_settings().database_statement_cache_size,
+    }
+    if get_settings().database_pgbouncer:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": prepared_statement_name,
+        }
+
+    return create_async_engine(
+        url or get_settings().database_url,
+        pool_size=get_settings().database_pool_size,
+        max_overflow=get_settings().database_max_overflow,
+        pool_recycle=get_settings().database_pool_recycle,
+        pool_pre_ping=get_settings().database_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+engine = create_engine()
 session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+read_engine = (
+    create_engine(get_settings().database_replica_url)
+    if get_settings().database_replica_url
+    else engine
+).execution_options(isolation_level="AUTOCOMMIT")
+read_session_maker = async_sessionmaker(
+    read_engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
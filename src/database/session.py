@@ -22,7 +22,7 @@ from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.engine import session_maker
+from database.engine import read_session_maker, session_maker
 
 
 @asynccontextmanager
@@ -34,3 +34,14 @@ async def async_session() -> AsyncGenerator[AsyncSession]:
 async def provide_async_session() -> AsyncGenerator[AsyncSession]:
     async with async_session() as session:
         yield session
+
+
+@asynccontextmanager
+async def read_only_session() -> AsyncGenerator[AsyncSession]:
+    async with read_session_maker() as session:
+        yield session
+
+
+async def provide_read_only_session() -> AsyncGenerator[AsyncSession]:
+    async with read_only_session() as session:
+        yield session
@@ -17,18 +17,37 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from asyncio import to_thread
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.v1.api import api_router
 from core.logging import setup_logging
+from utils.batcher import record_batcher
+from utils.cache import get_cache_hit_ratio
+from utils.events import call_event_hub
+from utils.minio import ensure_bucket
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None]:
+    await to_thread(ensure_bucket)
+    call_event_hub.start()
+    yield
+    await call_event_hub.stop()
+    record_batcher.flush()
+
+
 app = FastAPI(
     title="Phone Call Service",
     description="A service for managing phone calls and recordings.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -45,3 +64,8 @@ app.include_router(api_router)
 @app.get("/health")
 async def health_check() -> Response:
     return Response()
+
+
+@app.get("/metrics/cache")
+async def cache_metrics() -> dict[str, float | None]:
+    return {"hit_ratio": await get_cache_hit_ratio()}
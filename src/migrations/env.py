@@ -24,7 +24,7 @@ from alembic import context
 from sqlalchemy import Connection
 from sqlalchemy.ext.asyncio import create_async_engine
 
-from config import Settings
+from config import get_settings
 from models.call import Base
 
 config = context.config
@@ -36,7 +36,7 @@ target_metadata = Base.metadata
 
 
 def run_migrations_offline() -> None:
-    url = Settings().database_url
+    url = get_settings().database_url
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -56,7 +56,7 @@ def run_migrations(connection: Connection) -> None:
 
 
 async def run_async_migrations() -> None:
-    engine = create_async_engine(Settings().database_url)
+    engine = create_async_engine(get_settings().database_url)
 
     async with engine.connect() as connection:
         await connection.run_sync(run_migrations)
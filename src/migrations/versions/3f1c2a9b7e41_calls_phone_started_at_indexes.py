@@ -0,0 +1,46 @@
+"""
+calls phone started_at indexes.
+
+Revision ID: 3f1c2a9b7e41
+Revises: d6a214f1cc75
+Create Date: 2026-10-17 12:04:37.512903
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9b7e41"
+down_revision: str | Sequence[str] | None = "d6a214f1cc75"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_calls_caller_started_at",
+        "calls",
+        ["caller", "started_at"],
+        unique=False,
+        postgresql_include=["id"],
+    )
+    op.create_index(
+        "ix_calls_receiver_started_at",
+        "calls",
+        ["receiver", "started_at"],
+        unique=False,
+        postgresql_include=["id"],
+    )
+    op.drop_index(op.f("ix_calls_receiver"), table_name="calls")
+    op.drop_index(op.f("ix_calls_caller"), table_name="calls")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_calls_caller"), "calls", ["caller"], unique=False)
+    op.create_index(op.f("ix_calls_receiver"), "calls", ["receiver"], unique=False)
+    op.drop_index("ix_calls_receiver_started_at", table_name="calls")
+    op.drop_index("ix_calls_caller_started_at", table_name="calls")
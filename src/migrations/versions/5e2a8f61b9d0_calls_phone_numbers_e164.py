@@ -0,0 +1,93 @@
+"""
+calls phone numbers e164.
+
+Revision ID: 5e2a8f61b9d0
+Revises: c47e19a05d3b
+Create Date: 2026-10-17 17:02:26.640215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from phonenumbers import PhoneNumberFormat, format_number, parse
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2a8f61b9d0"
+down_revision: str | Sequence[str] | None = "c47e19a05d3b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        UPDATE calls
+        SET
+            caller = regexp_replace(
+                regexp_replace(caller, '^tel:|;.*$', '', 'g'),
+                '-',
+                '',
+                'g'
+            ),
+            receiver = regexp_replace(
+                regexp_replace(receiver, '^tel:|;.*$', '', 'g'),
+                '-',
+                '',
+                'g'
+            )
+        WHERE caller LIKE 'tel:%' OR receiver LIKE 'tel:%'
+        """,
+    )
+
+
+def to_rfc3966(number: str) -> str:
+    if not number.startswith("+"):
+        return number
+    return format_number(parse(number), PhoneNumberFormat.RFC3966)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    calls = sa.table(
+        "calls",
+        sa.column("id", sa.Uuid()),
+        sa.column("caller", sa.String()),
+        sa.column("receiver", sa.String()),
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(calls.c.id, calls.c.caller, calls.c.receiver)
+            .where(sa.or_(calls.c.caller.like("+%"), calls.c.receiver.like("+%")))
+            .order_by(calls.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(calls.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            return
+
+        connection.execute(
+            calls.update()
+            .where(calls.c.id == sa.bindparam("call_id"))
+            .values(
+                caller=sa.bindparam("new_caller"),
+                receiver=sa.bindparam("new_receiver"),
+            ),
+            [
+                {
+                    "call_id": row.id,
+                    "new_caller": to_rfc3966(row.caller),
+                    "new_receiver": to_rfc3966(row.receiver),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
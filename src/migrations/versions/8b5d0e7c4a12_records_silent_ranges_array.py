@@ -0,0 +1,78 @@
+"""
+records silent_ranges array.
+
+Revision ID: 8b5d0e7c4a12
+Revises: 3f1c2a9b7e41
+Create Date: 2026-10-17 13:21:08.904417
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8b5d0e7c4a12"
+down_revision: str | Sequence[str] | None = "3f1c2a9b7e41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "records",
+        sa.Column(
+            "silent_ranges",
+            postgresql.ARRAY(sa.Float(), dimensions=2),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE records
+        SET silent_ranges = ranges.silent_ranges
+        FROM (
+            SELECT record_id, array_agg(ARRAY[start, "end"] ORDER BY start)
+                AS silent_ranges
+            FROM silent_ranges
+            GROUP BY record_id
+        ) AS ranges
+        WHERE records.id = ranges.record_id
+        """,
+    )
+    op.alter_column("records", "silent_ranges", server_default=None)
+    op.drop_table("silent_ranges")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "silent_ranges",
+        sa.Column("record_id", sa.Uuid(), nullable=False),
+        sa.Column("start", sa.Float(), nullable=False),
+        sa.Column("end", sa.Float(), nullable=False),
+        sa.Column("id", sa.Uuid(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["record_id"], ["records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+    )
+    op.execute(
+        """
+        INSERT INTO silent_ranges (record_id, start, "end", id, created_at, updated_at)
+        SELECT
+            records.id,
+            records.silent_ranges[i][1],
+            records.silent_ranges[i][2],
+            gen_random_uuid(),
+            records.updated_at,
+            records.updated_at
+        FROM records, generate_subscripts(records.silent_ranges, 1) AS i
+        """,
+    )
+    op.drop_column("records", "silent_ranges")
@@ -0,0 +1,36 @@
+"""
+records content_hash.
+
+Revision ID: c47e19a05d3b
+Revises: 8b5d0e7c4a12
+Create Date: 2026-10-17 15:46:52.118734
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c47e19a05d3b"
+down_revision: str | Sequence[str] | None = "8b5d0e7c4a12"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("records", sa.Column("content_hash", sa.String(), nullable=True))
+    op.create_index(
+        op.f("ix_records_content_hash"),
+        "records",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_records_content_hash"), table_name="records")
+    op.drop_column("records", "content_hash")
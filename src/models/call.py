@@ -21,7 +21,8 @@ from datetime import datetime
 from enum import StrEnum
 from uuid import UUID
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import Float, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -35,31 +36,30 @@ class CallStatus(StrEnum):
 
 class Call(Base):
     __tablename__ = "calls"
+    __table_args__ = (
+        Index(
+            "ix_calls_caller_started_at",
+            "caller",
+            "started_at",
+            postgresql_include=["id"],
+        ),
+        Index(
+            "ix_calls_receiver_started_at",
+            "receiver",
+            "started_at",
+            postgresql_include=["id"],
+        ),
+    )
 
-    caller: Mapped[str] = mapped_column(nullable=False, index=True)
-    receiver: Mapped[str] = mapped_column(nullable=False, index=True)
+    caller: Mapped[str] = mapped_column(nullable=False)
+    receiver: Mapped[str] = mapped_column(nullable=False)
     started_at: Mapped[datetime]
     status: Mapped[CallStatus] = mapped_column(default=CallStatus.CREATED)
 
     record: Mapped["Record"] = relationship(
         back_populates="call",
         single_parent=True,
-        lazy="joined",
-    )
-
-
-class SilentRange(Base):
-    __tablename__ = "silent_ranges"
-
-    record_id: Mapped[UUID] = mapped_column(
-        ForeignKey("records.id", ondelete="CASCADE"),
-    )
-    start: Mapped[float]
-    end: Mapped[float]
-
-    record: Mapped["Record"] = relationship(
-        back_populates="silent_ranges",
-        lazy="joined",
+        lazy="raise",
     )
 
 
@@ -72,17 +72,18 @@ class Record(Base):
     )
     filename: Mapped[str]
     object_path: Mapped[str]
+    content_hash: Mapped[str | None] = mapped_column(index=True)
     duration: Mapped[float]
     transcription: Mapped[str]
     presigned_url: Mapped[str]
     expires_at: Mapped[datetime]
+    silent_ranges: Mapped[list[list[float]]] = mapped_column(
+        ARRAY(Float, dimensions=2),
+        default=list,
+    )
 
     call: Mapped[Call] = relationship(
         back_populates="record",
         single_parent=True,
-        lazy="joined",
-    )
-    silent_ranges: Mapped[list[SilentRange]] = relationship(
-        back_populates="record",
-        lazy="joined",
+        lazy="raise",
     )
@@ -18,10 +18,15 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
-from pydantic_extra_types.phone_numbers import PhoneNumber
+from pydantic import AfterValidator, BaseModel, ConfigDict, model_validator
+from pydantic_core import ErrorDetails
+
+from utils.phone import normalize_phone_number
+
+PhoneNumber = Annotated[str, AfterValidator(normalize_phone_number)]
 
 
 class CallCreate(BaseModel):
@@ -32,8 +37,8 @@ class CallCreate(BaseModel):
 
 class CallResponse(BaseModel):
     id: UUID
-    caller: PhoneNumber
-    receiver: PhoneNumber
+    caller: str
+    receiver: str
     started_at: datetime
     status: str
 
@@ -46,6 +51,14 @@ class SilentRange(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def from_pair(cls, data: object) -> object:
+        if isinstance(data, list | tuple):
+            start, end = data
+            return {"start": start, "end": end}
+        return data
+
 
 class RecordingResponse(BaseModel):
     filename: str
@@ -62,3 +75,18 @@ class CallFullResponse(CallResponse):
     record: RecordingResponse | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CallPage(BaseModel):
+    items: list[CallFullResponse]
+    next_cursor: str | None = None
+
+
+class CallBulkError(BaseModel):
+    index: int
+    errors: list[ErrorDetails]
+
+
+class CallBulkResponse(BaseModel):
+    ids: list[UUID | None]
+    errors: list[CallBulkError]
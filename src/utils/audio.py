@@ -17,24 +17,171 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from pydub import AudioSegment
-from pydub.silence import detect_silence
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from math import floor
+from shutil import which
+from subprocess import DEVNULL, PIPE, CalledProcessError, Popen
 
+import numpy as np
+from numpy.typing import NDArray
 
-def process_audio(file_path: str) -> tuple[float, str, list[tuple[float, float]]]:
-    audio = AudioSegment.from_file(file_path)
+from config import get_settings
 
-    duration = len(audio) / 1000.0
+MIN_SILENCE_LEN_MS = 1000
+SILENCE_THRESH_DBFS = -40
+SAMPLE_WIDTH = 2
+MAX_AMPLITUDE = 2 ** (SAMPLE_WIDTH * 8 - 1)
+
+
+class SilenceDetector:
+    def __init__(
+        self,
+        sample_rate: int,
+        min_silence_len: int,
+        silence_thresh: float,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.min_silence_len = min_silence_len
+        self.threshold = (floor(10 ** (silence_thresh / 20) * MAX_AMPLITUDE) + 1) ** 2
+        self.ranges: list[tuple[int, int]] = []
+
+        self._pending = np.empty(0, dtype=np.int16)
+        self._pending_start = 0
+        self._ms_count = 0
+        self._energy = np.empty(0)
+        self._frames = np.empty(0, dtype=np.intp)
+        self._offset = 0
+        self._range_start: int | None = None
+        self._last_start = 0
+
+    def feed(self, samples: NDArray[np.int16]) -> None:
+        samples = np.concatenate((self._pending, samples))
+        end_frame = self._pending_start + len(samples)
+        ms_count = (1000 * (end_frame + 1) - 1) // self.sample_rate
+        bounds = (
+            np.arange(self._ms_count, ms_count + 1) * self.sample_rate // 1000
+            - self._pending_start
+        )
+        self._pending = samples[bounds[-1] :]
+        self._pending_start += int(bounds[-1])
+        self._ms_count = ms_count
+
+        cumulative = np.concatenate(
+            ([0.0], np.cumsum(np.square(samples[: bounds[-1]], dtype=float))),
+        )
+        energy = np.concatenate((self._energy, np.diff(cumulative[bounds])))
+        frames = np.concatenate((self._frames, np.diff(bounds)))
+        window_count = len(energy) - self.min_silence_len + 1
+        if window_count > 0:
+            cumulative = np.concatenate(([0.0], np.cumsum(energy)))
+            window_energy = (
+                cumulative[self.min_silence_len :] - cumulative[:window_count]
+            )
+            cumulative_frames = np.concatenate(([0], np.cumsum(frames)))
+            window_frames = (
+                cumulative_frames[self.min_silence_len :]
+                - cumulative_frames[:window_count]
+            )
+            self._merge(
+                np.flatnonzero(window_energy < self.threshold * window_frames)
+                + self._offset,
+            )
+            energy = energy[window_count:]
+            frames = frames[window_count:]
+            self._offset += window_count
+        self._energy = energy
+        self._frames = frames
+
+    def _merge(self, silence_starts: NDArray[np.intp]) -> None:
+        if silence_starts.size == 0:
+            return
+        if self._range_start is not None:
+            silence_starts = np.concatenate(([self._last_start], silence_starts))
+
+        gaps = np.flatnonzero(np.diff(silence_starts) > self.min_silence_len)
+        range_starts = silence_starts[np.concatenate(([0], gaps + 1))].tolist()
+        range_ends = (silence_starts[gaps] + self.min_silence_len).tolist()
+        if self._range_start is not None:
+            range_starts[0] = self._range_start
+
+        self.ranges.extend(zip(range_starts[:-1], range_ends, strict=True))
+        self._range_start = range_starts[-1]
+        self._last_start = int(silence_starts[-1])
+
+    def finish(self) -> list[tuple[int, int]]:
+        if self._range_start is not None:
+            self.ranges.append(
+                (self._range_start, self._last_start + self.min_silence_len),
+            )
+            self._range_start = None
+        return self.ranges
 
-    transcription = " ".join(f"word-{i}" for i in range(round(duration)))
 
-    silence_ranges_ms = detect_silence(
-        audio,
-        min_silence_len=1000,
-        silence_thresh=-40,
+def decode_audio(source: str) -> Iterator[NDArray[np.int16]]:
+    ffmpeg = which("ffmpeg")
+    if ffmpeg is None:
+        msg = "ffmpeg not found"
+        raise FileNotFoundError(msg)
+
+    sample_rate = get_settings().audio_sample_rate
+    block_size = sample_rate * get_settings().audio_block_seconds * SAMPLE_WIDTH
+    with (
+        ThreadPoolExecutor(max_workers=1) as executor,
+        Popen(  # noqa: S603
+            [
+                ffmpeg,
+                "-nostdin",
+                "-v",
+                "error",
+                "-i",
+                source,
+                "-f",
+                "s16le",
+                "-ac",
+                "1",
+                "-ar",
+                str(sample_rate),
+                "pipe:1",
+            ],
+            stdin=DEVNULL,
+            stdout=PIPE,
+            stderr=PIPE,
+        ) as decoder,
+    ):
+        stderr_reader = executor.submit(decoder.stderr.read)
+
+        decoded = False
+        while block := decoder.stdout.read(block_size):
+            decoded = True
+            yield np.frombuffer(block, dtype="<i2")
+        stderr = stderr_reader.result()
+
+    # ffmpeg exits 0 when it cannot demux a container that needs seeking.
+    if decoder.returncode or (stderr and not decoded):
+        raise CalledProcessError(decoder.returncode, decoder.args, stderr=stderr)
+
+
+def process_audio(
+    source: str,
+) -> tuple[float, str, list[tuple[float, float]]]:
+    sample_rate = get_settings().audio_sample_rate
+    detector = SilenceDetector(
+        sample_rate,
+        min_silence_len=MIN_SILENCE_LEN_MS,
+        silence_thresh=SILENCE_THRESH_DBFS,
     )
+    frame_count = 0
+    for samples in decode_audio(source):
+        frame_count += len(samples)
+        detector.feed(samples)
+
+    duration = frame_count / sample_rate
+
+    transcription = " ".join(f"word-{i}" for i in range(round(duration)))
+
     silent_ranges_sec: list[tuple[float, float]] = [
-        (start / 1000.0, end / 1000.0) for start, end in silence_ranges_ms
+        (start / 1000.0, end / 1000.0) for start, end in detector.finish()
     ]
 
     return duration, transcription, silent_ranges_sec
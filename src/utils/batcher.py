@@ -0,0 +1,60 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from asyncio import TimerHandle, get_running_loop
+from uuid import UUID
+
+from config import get_settings
+from worker.tasks import process_record_task, process_records_batch
+
+
+class RecordBatcher:
+    # Buffered ids live only in this process: a graceful shutdown flushes
+    # them, but a crash loses them and their calls stay CREATED until the
+    # recording is uploaded again. The default batch size of 1 never buffers.
+    def __init__(self) -> None:
+        self._record_ids: list[UUID] = []
+        self._flush_handle: TimerHandle | None = None
+
+    async def add(self, record_id: UUID) -> None:
+        if get_settings().record_batch_size <= 1:
+            process_record_task.delay(record_id)
+            return
+
+        self._record_ids.append(record_id)
+        if len(self._record_ids) >= get_settings().record_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = get_running_loop().call_later(
+                get_settings().record_batch_window.total_seconds(),
+                self.flush,
+            )
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._record_ids:
+            return
+
+        record_ids, self._record_ids = self._record_ids, []
+        process_records_batch.delay(record_ids)
+
+
+record_batcher = RecordBatcher()
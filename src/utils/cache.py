@@ -0,0 +1,133 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from functools import cache
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+from config import get_settings
+from schemas.call import CallFullResponse
+
+CACHE_HITS_KEY = "calls:cache:hits"
+CACHE_MISSES_KEY = "calls:cache:misses"
+
+
+@cache
+def get_redis() -> Redis:
+    return Redis.from_url(get_settings().redis_url)
+
+
+def call_cache_key(call_id: UUID) -> str:
+    return f"calls:{call_id}"
+
+
+def call_version_key(call_id: UUID) -> str:
+    return f"calls:{call_id}:version"
+
+
+async def get_cached_call(call_id: UUID) -> tuple[str, bytes] | None:
+    try:
+        etag, payload = await get_redis().hmget(
+            call_cache_key(call_id),
+            ["etag", "payload"],
+        )
+        await get_redis().incr(CACHE_MISSES_KEY if payload is None else CACHE_HITS_KEY)
+    except RedisError:
+        get_settings().logger.exception("Failed to read call %s from cache", call_id)
+        return None
+    if etag is None or payload is None:
+        return None
+    return etag.decode(), payload
+
+
+async def get_call_version(call_id: UUID) -> int | None:
+    try:
+        version = await get_redis().get(call_version_key(call_id))
+    except RedisError:
+        get_settings().logger.exception("Failed to read call %s version", call_id)
+        return None
+    return int(version or 0)
+
+
+async def cache_call(
+    response: CallFullResponse,
+    etag: str,
+    version: int | None,
+) -> None:
+    if version is None:
+        return
+
+    ttl = get_settings().call_cache_ttl
+    if response.record is not None:
+        ttl = min(
+            ttl,
+            response.record.expires_at
+            - datetime.now(UTC).replace(tzinfo=None)
+            - get_settings().presigned_url_refresh,
+        )
+    if ttl.total_seconds() < 1:
+        return
+
+    try:
+        async with get_redis().pipeline() as pipeline:
+            await pipeline.watch(call_version_key(response.id))
+            if int(await pipeline.get(call_version_key(response.id)) or 0) != version:
+                return
+            pipeline.multi()
+            pipeline.hset(
+                call_cache_key(response.id),
+                mapping={"etag": etag, "payload": response.model_dump_json()},
+            )
+            pipeline.expire(call_cache_key(response.id), ttl)
+            await pipeline.execute()
+    except WatchError:
+        return
+    except RedisError:
+        get_settings().logger.exception("Failed to cache call %s", response.id)
+
+
+async def invalidate_calls(call_ids: Iterable[UUID]) -> None:
+    call_ids = list(call_ids)
+    if not call_ids:
+        return
+
+    ttl = get_settings().call_cache_ttl
+    try:
+        async with get_redis().pipeline(transaction=False) as pipeline:
+            for call_id in call_ids:
+                pipeline.delete(call_cache_key(call_id))
+                pipeline.incr(call_version_key(call_id))
+                pipeline.expire(call_version_key(call_id), ttl)
+            await pipeline.execute()
+    except RedisError:
+        get_settings().logger.exception("Failed to invalidate calls %s", call_ids)
+
+
+async def get_cache_hit_ratio() -> float | None:
+    try:
+        hits, misses = await get_redis().mget(CACHE_HITS_KEY, CACHE_MISSES_KEY)
+    except RedisError:
+        get_settings().logger.exception("Failed to read cache counters")
+        return None
+    hits, misses = int(hits or 0), int(misses or 0)
+    return hits / (hits + misses) if hits + misses else 0.0
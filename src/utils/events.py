@@ -0,0 +1,108 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from asyncio import CancelledError, Queue, Task, create_task, sleep
+from collections.abc import Iterable
+from contextlib import suppress
+from json import dumps, loads
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from config import get_settings
+from models.call import CallStatus
+from utils.cache import get_redis
+
+CALL_EVENTS_CHANNEL = "calls:events"
+
+
+async def publish_call_statuses(
+    call_ids: Iterable[UUID],
+    call_status: CallStatus,
+) -> None:
+    call_ids = list(call_ids)
+    try:
+        async with get_redis().pipeline(transaction=False) as pipeline:
+            for call_id in call_ids:
+                pipeline.publish(
+                    CALL_EVENTS_CHANNEL,
+                    dumps({"call_id": str(call_id), "status": call_status}),
+                )
+            await pipeline.execute()
+    except RedisError:
+        get_settings().logger.exception(
+            "Failed to publish %s for calls %s",
+            call_status,
+            call_ids,
+        )
+
+
+class CallEventHub:
+    def __init__(self) -> None:
+        self._subscribers: dict[UUID, set[Queue[CallStatus]]] = {}
+        self._listener: Task[None] | None = None
+
+    def start(self) -> None:
+        self._listener = create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        with suppress(CancelledError):
+            await self._listener
+        self._listener = None
+
+    def subscribe(self, call_id: UUID) -> Queue[CallStatus]:
+        queue: Queue[CallStatus] = Queue()
+        self._subscribers.setdefault(call_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, call_id: UUID, queue: Queue[CallStatus]) -> None:
+        queues = self._subscribers.get(call_id, set())
+        queues.discard(queue)
+        if not queues:
+            self._subscribers.pop(call_id, None)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(CALL_EVENTS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        try:
+                            self._dispatch(message["data"])
+                        except Exception:  # noqa: BLE001
+                            get_settings().logger.exception(
+                                "Invalid call event %r",
+                                message["data"],
+                            )
+            except RedisError:
+                get_settings().logger.exception("Call events subscription failed")
+                await sleep(1)
+
+    def _dispatch(self, data: bytes) -> None:
+        event = loads(data)
+        for queue in self._subscribers.get(UUID(event["call_id"]), ()):
+            queue.put_nowait(CallStatus(event["status"]))
+
+
+call_event_hub = CallEventHub()
@@ -17,21 +17,110 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from pathlib import Path
+from shutil import copyfileobj
+
 from minio import Minio
+from urllib3 import BaseHTTPResponse, PoolManager, Retry, Timeout
 
-from config import Settings
+from config import get_settings
 
 
-def download_file_from_minio(object_name: str, file_path: str) -> None:
-    minio_client = Minio(
-        Settings().minio_endpoint,
-        access_key=Settings().minio_access_key,
-        secret_key=Settings().minio_secret_key,
+@cache
+def get_minio_client() -> Minio:
+    timeout = timedelta(minutes=5).total_seconds()
+    http_client = PoolManager(
+        timeout=Timeout(connect=timeout, read=timeout),
+        maxsize=get_settings().minio_pool_size,
+        cert_reqs="CERT_NONE",
+        retries=Retry(
+            total=5,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+    return Minio(
+        get_settings().minio_endpoint,
+        access_key=get_settings().minio_access_key,
+        secret_key=get_settings().minio_secret_key,
         secure=True,
+        region=get_settings().minio_region,
+        http_client=http_client,
         cert_check=False,
     )
-    minio_client.fget_object(
-        bucket_name=Settings().minio_bucket_name,
+
+
+def ensure_bucket() -> None:
+    minio_client = get_minio_client()
+    if not minio_client.bucket_exists(get_settings().minio_bucket_name):
+        minio_client.make_bucket(get_settings().minio_bucket_name)
+
+
+_presigned_urls: OrderedDict[str, tuple[str, datetime]] = OrderedDict()
+
+
+def _evict_presigned_urls(now: datetime) -> None:
+    while _presigned_urls:
+        _, expires_at = next(iter(_presigned_urls.values()))
+        if (
+            len(_presigned_urls) <= get_settings().presigned_url_cache_size
+            and expires_at - now > get_settings().presigned_url_refresh
+        ):
+            return
+        _presigned_urls.popitem(last=False)
+
+
+def get_presigned_url(object_name: str) -> tuple[str, datetime]:
+    request_date = datetime.now(UTC)
+    now = request_date.replace(tzinfo=None)
+    cached = _presigned_urls.get(object_name)
+    if cached is not None and cached[1] - now > get_settings().presigned_url_refresh:
+        _presigned_urls.move_to_end(object_name)
+        return cached
+
+    url = get_minio_client().presigned_get_object(
+        bucket_name=get_settings().minio_bucket_name,
+        object_name=object_name,
+        expires=get_settings().presigned_url_expires,
+        request_date=request_date,
+    )
+    presigned = (url, now + get_settings().presigned_url_expires)
+    _presigned_urls[object_name] = presigned
+    _presigned_urls.move_to_end(object_name)
+    _evict_presigned_urls(now)
+    return presigned
+
+
+def download_file_from_minio(object_name: str, file_path: str) -> None:
+    get_minio_client().fget_object(
+        bucket_name=get_settings().minio_bucket_name,
         object_name=object_name,
         file_path=file_path,
     )
+
+
+@contextmanager
+def open_minio_object(object_name: str) -> Iterator[BaseHTTPResponse]:
+    response = get_minio_client().get_object(
+        bucket_name=get_settings().minio_bucket_name,
+        object_name=object_name,
+    )
+    try:
+        yield response
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def stream_file_from_minio(object_name: str, file_path: str) -> None:
+    with (
+        suppress(BrokenPipeError),
+        Path(file_path).open("wb", buffering=0) as file,
+        open_minio_object(object_name) as response,
+    ):
+        copyfileobj(response, file)
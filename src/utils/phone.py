@@ -0,0 +1,42 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from functools import lru_cache
+
+from phonenumbers import (
+    NumberParseException,
+    PhoneNumberFormat,
+    format_number,
+    is_valid_number,
+    parse,
+)
+
+from config import get_settings
+
+
+@lru_cache(maxsize=get_settings().phone_number_cache_size)
+def normalize_phone_number(value: str) -> str:
+    msg = "value is not a valid phone number"
+    try:
+        phone_number = parse(value)
+    except NumberParseException as error:
+        raise ValueError(msg) from error
+    if not is_valid_number(phone_number):
+        raise ValueError(msg)
+    return format_number(phone_number, PhoneNumberFormat.E164)
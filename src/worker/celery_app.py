@@ -19,21 +19,28 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from celery import Celery
 
-from config import Settings
+from config import get_settings
 from core.logging import setup_logging
 
 setup_logging()
 
+RECORDINGS_QUEUE = "recordings"
+
 app = Celery(
-    backend=Settings().redis_url,
-    broker=Settings().redis_url,
+    broker=get_settings().redis_url,
     include="worker.tasks",
 )
 
 app.conf.update(
     task_serializer="json",
     accept_content=["json"],
-    result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_ignore_result=True,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_routes={"worker.tasks.*": {"queue": RECORDINGS_QUEUE}},
+    worker_prefetch_multiplier=1,
+    worker_pool="threads",
+    worker_concurrency=get_settings().worker_prefetch_depth,
 )
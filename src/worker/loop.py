@@ -0,0 +1,95 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from asyncio import (
+    AbstractEventLoop,
+    Semaphore,
+    get_running_loop,
+    new_event_loop,
+    run_coroutine_threadsafe,
+)
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Lock, Thread
+from typing import Any
+
+from celery.signals import worker_init, worker_shutdown
+
+from config import get_settings
+from database.engine import engine
+
+
+class WorkerLoop:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._loop: AbstractEventLoop | None = None
+        self._thread: Thread | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self.prefetch = Semaphore(get_settings().worker_prefetch_depth)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._executor = ProcessPoolExecutor(
+                max_workers=get_settings().worker_analysis_processes,
+                mp_context=get_context("spawn"),
+            )
+            self._loop = new_event_loop()
+            self._thread = Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+
+    def run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self._loop is None:
+            self.start()
+        return run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def analyze[T](self, function: Callable[..., T], *args: object) -> T:
+        return await get_running_loop().run_in_executor(
+            self._executor,
+            function,
+            *args,
+        )
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            run_coroutine_threadsafe(engine.dispose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._executor.shutdown()
+            self._loop = None
+            self._thread = None
+            self._executor = None
+
+
+worker_loop = WorkerLoop()
+
+
+@worker_init.connect
+def start_worker_loop(**_: object) -> None:
+    worker_loop.start()
+
+
+@worker_shutdown.connect
+def stop_worker_loop(**_: object) -> None:
+    worker_loop.stop()
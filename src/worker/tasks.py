@@ -17,49 +17,149 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from asyncio import run, to_thread
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from asyncio import create_task, gather, to_thread
+from datetime import UTC, datetime
+from os import O_NONBLOCK, O_RDONLY, close, mkfifo
+from os import open as os_open
+from pathlib import Path
+from subprocess import CalledProcessError
+from tempfile import TemporaryDirectory
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select, update
 
-from config import Settings
+from config import get_settings
 from database.session import async_session
-from models.call import CallStatus, Record, SilentRange
+from models.call import Call, CallStatus, Record
 from utils.audio import process_audio
-from utils.minio import download_file_from_minio
+from utils.cache import invalidate_calls
+from utils.events import publish_call_statuses
+from utils.minio import download_file_from_minio, stream_file_from_minio
 from worker.celery_app import app
+from worker.loop import worker_loop
 
 
-async def process_audio_from_minio(record_id: UUID) -> None:
+async def analyze_streamed(
+    object_name: str,
+    fifo_path: Path,
+) -> tuple[float, str, list[tuple[float, float]]]:
+    mkfifo(fifo_path)
+    feeder = create_task(
+        to_thread(stream_file_from_minio, object_name, str(fifo_path)),
+    )
+    try:
+        return await worker_loop.analyze(process_audio, str(fifo_path))
+    finally:
+        try:
+            # Unblock a feeder still waiting for ffmpeg to open the pipe.
+            close(os_open(fifo_path, O_RDONLY | O_NONBLOCK))
+            await feeder
+        finally:
+            fifo_path.unlink()
+
+
+async def analyze_downloaded(
+    object_name: str,
+    file_path: Path,
+) -> tuple[float, str, list[tuple[float, float]]]:
+    try:
+        await to_thread(download_file_from_minio, object_name, str(file_path))
+        return await worker_loop.analyze(process_audio, str(file_path))
+    finally:
+        file_path.unlink(missing_ok=True)
+
+
+async def analyze_record(
+    record: Row,
+    tmp_dir: str,
+) -> tuple[float, str, list[tuple[float, float]]]:
+    file_path = Path(tmp_dir) / f"{record.id}{Path(record.object_path).suffix}"
+    async with worker_loop.prefetch:
+        if file_path.suffix.lower() not in get_settings().audio_seekable_formats:
+            try:
+                return await analyze_streamed(record.object_path, file_path)
+            except CalledProcessError:
+                get_settings().logger.warning(
+                    "Piped decoding of %s failed, retrying from a file",
+                    record.object_path,
+                    exc_info=True,
+                )
+        return await analyze_downloaded(record.object_path, file_path)
+
+
+async def process_records_from_minio(record_ids: list[UUID]) -> dict[str, str]:
+    results = dict.fromkeys(map(str, record_ids), "not_found")
     async with async_session() as session:
-        record = await session.scalar(select(Record).where(Record.id == record_id))
-        if record is None:
-            Settings().logger.error("Record not found: %s", record_id)
-            return
-        record.call.status = CallStatus.PROCESSING
+        records = (
+            await session.execute(
+                select(Record.id, Record.call_id, Record.object_path).where(
+                    Record.id.in_(record_ids),
+                ),
+            )
+        ).all()
+        if not records:
+            get_settings().logger.error("Records not found: %s", record_ids)
+            return results
+        call_ids = [record.call_id for record in records]
+        await session.execute(
+            update(Call)
+            .where(Call.id.in_(call_ids))
+            .values(status=CallStatus.PROCESSING),
+        )
+    await invalidate_calls(call_ids)
+    await publish_call_statuses(call_ids, CallStatus.PROCESSING)
 
     with TemporaryDirectory() as tmp_dir:
-        with NamedTemporaryFile(dir=tmp_dir, delete=False) as file:
-            file_path = file.name
-        await to_thread(download_file_from_minio, record.object_path, file_path)
-        duration, transcription, silent_ranges = await to_thread(
-            process_audio,
-            file_path,
+        analyses = await gather(
+            *(analyze_record(record, tmp_dir) for record in records),
+            return_exceptions=True,
         )
 
-    async with async_session() as session:
-        record = await session.scalar(select(Record).where(Record.id == record_id))
-        if record is None:
-            Settings().logger.error("Record not found: %s", record_id)
-            return
-        record.duration = duration
-        record.transcription = transcription
-        for start, end in silent_ranges:
-            session.add(SilentRange(record_id=record_id, start=start, end=end))
-        record.call.status = CallStatus.READY
-
-
-@app.task
+    now = datetime.now(UTC).replace(tzinfo=None)
+    saved_records = []
+    ready_call_ids = []
+    for record, analysis in zip(records, analyses, strict=True):
+        if isinstance(analysis, Exception):
+            get_settings().logger.error(
+                "Failed to process record %s",
+                record.id,
+                exc_info=analysis,
+            )
+            results[str(record.id)] = "failed"
+            continue
+        duration, transcription, silent_ranges = analysis
+        saved_records.append(
+            {
+                "id": record.id,
+                "duration": duration,
+                "transcription": transcription,
+                "silent_ranges": [[start, end] for start, end in silent_ranges],
+                "updated_at": now,
+            },
+        )
+        ready_call_ids.append(record.call_id)
+        results[str(record.id)] = CallStatus.READY
+
+    if saved_records:
+        async with async_session() as session:
+            await session.execute(update(Record), saved_records)
+            await session.execute(
+                update(Call)
+                .where(Call.id.in_(ready_call_ids))
+                .values(status=CallStatus.READY),
+            )
+        await invalidate_calls(ready_call_ids)
+        await publish_call_statuses(ready_call_ids, CallStatus.READY)
+
+    return results
+
+
+@app.task(ignore_result=True)
 def process_record_task(record_id: UUID) -> None:
-    run(process_audio_from_minio(record_id))
+    worker_loop.run(process_records_from_minio([record_id]))
+
+
+@app.task(ignore_result=True)
+def process_records_batch(record_ids: list[UUID]) -> None:
+    results = worker_loop.run(process_records_from_minio(record_ids))
+    get_settings().logger.info("Processed records: %s", results)
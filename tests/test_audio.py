@@ -0,0 +1,131 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+
+from utils.audio import MIN_SILENCE_LEN_MS, SILENCE_THRESH_DBFS, SilenceDetector
+
+
+def make_audio(
+    rng: np.random.Generator,
+    sample_rate: int,
+    seconds: float,
+    gaps: Iterable[tuple[float, float, float]],
+) -> NDArray[np.int16]:
+    amplitude = np.full(round(sample_rate * seconds), 3000.0)
+    for start, end, gap_amplitude in gaps:
+        amplitude[round(start * sample_rate) : round(end * sample_rate)] = gap_amplitude
+    samples = rng.standard_normal(len(amplitude)) * amplitude
+    return np.clip(samples, -(2**15), 2**15 - 1).astype(np.int16)
+
+
+def reference_ranges(
+    samples: NDArray[np.int16],
+    sample_rate: int,
+) -> list[tuple[int, int]]:
+    segment = AudioSegment(
+        samples.tobytes(),
+        frame_rate=sample_rate,
+        sample_width=2,
+        channels=1,
+    )
+    return [
+        (start, end)
+        for start, end in detect_silence(
+            segment,
+            min_silence_len=MIN_SILENCE_LEN_MS,
+            silence_thresh=SILENCE_THRESH_DBFS,
+        )
+    ]
+
+
+def detect(
+    samples: NDArray[np.int16],
+    sample_rate: int,
+    block_sizes: Iterable[int],
+) -> list[tuple[int, int]]:
+    detector = SilenceDetector(
+        sample_rate,
+        min_silence_len=MIN_SILENCE_LEN_MS,
+        silence_thresh=SILENCE_THRESH_DBFS,
+    )
+    offset = 0
+    for block_size in block_sizes:
+        detector.feed(samples[offset : offset + block_size])
+        offset += block_size
+    detector.feed(samples[offset:])
+    return detector.finish()
+
+
+@pytest.mark.parametrize("sample_rate", [8_000, 16_000, 22_050, 44_100])
+@pytest.mark.parametrize("seed", range(3))
+def test_random_block_splits_match_pydub(sample_rate: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    samples = make_audio(
+        rng,
+        sample_rate,
+        20,
+        [(2, 3.5, 20), (6, 6.8, 20), (8.2, 12, 20), (12.9, 14, 10), (19, 20, 0)],
+    )
+    block_sizes = rng.integers(1, sample_rate * 3, size=100)
+
+    assert detect(samples, sample_rate, block_sizes) == reference_ranges(
+        samples,
+        sample_rate,
+    )
+
+
+@pytest.mark.parametrize("seconds", [0, 0.001, 0.5, 0.999])
+def test_audio_shorter_than_min_silence_len(seconds: float) -> None:
+    samples = np.zeros(round(16_000 * seconds), dtype=np.int16)
+
+    assert detect(samples, 16_000, [1_000]) == []
+    assert reference_ranges(samples, 16_000) == []
+
+
+def test_range_spanning_block_boundary() -> None:
+    rng = np.random.default_rng(0)
+    samples = make_audio(rng, 16_000, 12, [(4.5, 6.5, 20), (7.5, 11, 20)])
+
+    expected = reference_ranges(samples, 16_000)
+    assert len(expected) == 2
+    assert expected[0][0] < 5_000 < expected[0][1]
+    assert detect(samples, 16_000, [80_000]) == expected
+    assert detect(samples, 16_000, [16_000] * 12) == expected
+    assert detect(samples, 16_000, [1] * 16_000) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_threshold_matches_pydub_integer_rms(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(2, 15)
+    samples = make_audio(
+        rng,
+        16_000,
+        20,
+        [(start, start + rng.uniform(1.5, 3), rng.uniform(320, 336))],
+    )
+
+    assert detect(samples, 16_000, [160_000]) == reference_ranges(samples, 16_000)
@@ -0,0 +1,179 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from orjson import dumps
+
+from api.v1.api import api_router
+from config import get_settings
+from database.session import provide_async_session
+
+pytestmark = pytest.mark.anyio
+
+MAX_ITEMS = 3
+MAX_BYTES = 1024
+NDJSON = {"Content-Type": "application/x-ndjson"}
+VALID_CALL = {
+    "caller": "+79161234567",
+    "receiver": "+79167654321",
+    "started_at": "2025-01-01T00:00:00Z",
+}
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.rows: list[dict[str, object]] = []
+
+    async def scalars(
+        self,
+        _statement: object,
+        rows: list[dict[str, object]],
+    ) -> list[UUID]:
+        self.rows.extend(rows)
+        return [uuid4() for _ in rows]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def session() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+async def client(
+    session: FakeSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[AsyncClient]:
+    monkeypatch.setattr(get_settings(), "calls_bulk_max_items", MAX_ITEMS)
+    monkeypatch.setattr(get_settings(), "calls_bulk_max_bytes", MAX_BYTES)
+
+    async def provide_fake_session() -> AsyncIterator[FakeSession]:
+        yield session
+
+    app = FastAPI()
+    app.include_router(api_router)
+    app.dependency_overrides[provide_async_session] = provide_fake_session
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        yield client
+
+
+async def test_rejects_ndjson_over_item_limit_while_streaming(
+    client: AsyncClient,
+    session: FakeSession,
+) -> None:
+    sent = 0
+
+    async def lines() -> AsyncIterator[bytes]:
+        nonlocal sent
+        for _ in range(MAX_ITEMS * 2):
+            sent += 1
+            yield dumps(VALID_CALL) + b"\n"
+
+    response = await client.post("/v1/calls/bulk/", content=lines(), headers=NDJSON)
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Too many calls"}
+    assert sent == MAX_ITEMS + 1
+    assert session.rows == []
+
+
+async def test_rejects_json_array_over_item_limit(
+    client: AsyncClient,
+    session: FakeSession,
+) -> None:
+    response = await client.post(
+        "/v1/calls/bulk/",
+        content=dumps([VALID_CALL] * (MAX_ITEMS + 1)),
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Too many calls"}
+    assert session.rows == []
+
+
+async def test_rejects_body_over_content_length(client: AsyncClient) -> None:
+    response = await client.post("/v1/calls/bulk/", content=b" " * (MAX_BYTES + 1))
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+
+
+async def test_rejects_chunked_body_over_byte_limit(client: AsyncClient) -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for _ in range(MAX_BYTES):
+            yield b"\n\n"
+
+    response = await client.post("/v1/calls/bulk/", content=chunks(), headers=NDJSON)
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+
+
+async def test_rejects_non_array_json(client: AsyncClient) -> None:
+    response = await client.post("/v1/calls/bulk/", content=dumps(VALID_CALL))
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Expected a JSON array of calls"}
+
+
+async def test_rejects_invalid_json(client: AsyncClient) -> None:
+    response = await client.post("/v1/calls/bulk/", content=b"[{")
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid JSON"}
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+async def test_aligns_ids_and_errors_with_item_indexes(
+    client: AsyncClient,
+    session: FakeSession,
+    ndjson: bool,  # noqa: FBT001
+) -> None:
+    items = [
+        {**VALID_CALL, "caller": "not a phone"},
+        VALID_CALL,
+        {"caller": VALID_CALL["caller"]},
+    ]
+    content = (
+        b"".join(dumps(item) + b"\n" for item in items) if ndjson else dumps(items)
+    )
+
+    response = await client.post(
+        "/v1/calls/bulk/",
+        content=content,
+        headers=NDJSON if ndjson else {},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [call_id is not None for call_id in body["ids"]] == [False, True, False]
+    assert [error["index"] for error in body["errors"]] == [0, 2]
+    assert len(session.rows) == 1
@@ -0,0 +1,203 @@
+"""
+Phone Call Service.
+
+Copyright (C) 2025  Andrew Kozmin <syn.kolbasyn.06@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.v1 import calls
+from api.v1.api import api_router
+from config import get_settings
+from database.engine import engine
+from database.session import async_session
+from models.base import Base
+from models.call import Call, CallStatus, Record
+
+pytestmark = pytest.mark.anyio
+
+PHONE_NUMBER = "+79161234567"
+RECORDED_CALLS = 6
+UNRECORDED_CALLS = 4
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[None]:
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+    except (OSError, SQLAlchemyError):
+        await engine.dispose()
+        pytest.skip("PostgreSQL is not available")
+
+    yield
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def call_ids(database: None) -> list[UUID]:  # noqa: ARG001
+    started_at = datetime(2025, 1, 1, tzinfo=UTC).replace(tzinfo=None)
+    new_calls = []
+    for index in range(RECORDED_CALLS + UNRECORDED_CALLS):
+        call = Call(
+            caller=PHONE_NUMBER if index % 2 else "+79167654321",
+            receiver="+79167654321" if index % 2 else PHONE_NUMBER,
+            started_at=started_at + timedelta(minutes=index, microseconds=index),
+            status=CallStatus.READY,
+        )
+        if index < RECORDED_CALLS:
+            call.record = Record(
+                filename=f"{index}.mp3",
+                object_path=f"recordings/{index}.mp3",
+                duration=60.0,
+                transcription="word " * 60,
+                presigned_url="",
+                expires_at=started_at,
+                silent_ranges=[
+                    [second, second + 1.5]
+                    for second in range(0, 60, 2)
+                    if index < RECORDED_CALLS - 1
+                ],
+            )
+        new_calls.append(call)
+
+    async with async_session() as session:
+        session.add_all(new_calls)
+    return [call.id for call in new_calls]
+
+
+@pytest.fixture
+def statements() -> Iterator[list[tuple[str, int]]]:
+    executed: list[tuple[str, int]] = []
+
+    def record(
+        _connection: object,
+        cursor: object,
+        statement: str,
+        _parameters: object,
+        _context: object,
+        _executemany: object,
+    ) -> None:
+        executed.append((statement, cursor.rowcount))
+
+    event.listen(engine.sync_engine, "after_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "after_cursor_execute", record)
+
+
+@pytest.fixture
+async def client(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AsyncClient]:
+    async def no_cached_call(_: UUID) -> None:
+        return None
+
+    monkeypatch.setattr(calls, "get_cached_call", no_cached_call)
+    monkeypatch.setattr(calls, "get_call_version", no_cached_call)
+
+    app = FastAPI()
+    app.include_router(api_router)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        yield client
+
+
+@pytest.mark.usefixtures("call_ids")
+@pytest.mark.parametrize("fast_json", [False, True])
+@pytest.mark.parametrize(
+    ("limit", "expected_rows"),
+    [(3, 4), (100, RECORDED_CALLS + UNRECORDED_CALLS)],
+)
+async def test_find_call_runs_one_bounded_query(
+    statements: list[tuple[str, int]],
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    fast_json: bool,  # noqa: FBT001
+    limit: int,
+    expected_rows: int,
+) -> None:
+    monkeypatch.setattr(get_settings(), "calls_fast_json", fast_json)
+
+    response = await client.get(
+        "/v1/calls/find/",
+        params={"phone_number": PHONE_NUMBER, "limit": limit},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == min(limit, expected_rows)
+    assert [rows for _, rows in statements] == [expected_rows]
+
+
+@pytest.mark.usefixtures("call_ids")
+async def test_find_call_fast_json_matches_pydantic(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    params = {"phone_number": PHONE_NUMBER, "limit": 100}
+    monkeypatch.setattr(get_settings(), "calls_fast_json", False)
+    expected = await client.get("/v1/calls/find/", params=params)
+    monkeypatch.setattr(get_settings(), "calls_fast_json", True)
+
+    response = await client.get("/v1/calls/find/", params=params)
+
+    assert response.status_code == expected.status_code == 200
+    assert response.content == expected.content
+
+
+async def test_get_call_runs_one_query(
+    call_ids: list[UUID],
+    statements: list[tuple[str, int]],
+    client: AsyncClient,
+) -> None:
+    response = await client.get(f"/v1/calls/{call_ids[0]}/")
+
+    assert response.status_code == 200
+    assert len(response.json()["record"]["silent_ranges"]) == 30
+    assert [rows for _, rows in statements] == [1]
+
+
+async def test_get_call_answers_matching_etag_with_one_lookup(
+    call_ids: list[UUID],
+    statements: list[tuple[str, int]],
+    client: AsyncClient,
+) -> None:
+    etag = (await client.get(f"/v1/calls/{call_ids[0]}/")).headers["ETag"]
+    statements.clear()
+
+    response = await client.get(
+        f"/v1/calls/{call_ids[0]}/",
+        headers={"If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert [rows for _, rows in statements] == [1]